@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+benchmark_knowledge_memory.py — Compare peak memory of merging new entries
+into a large knowledge file: the old load-everything merge vs the streaming
+merge_knowledge() in process_knowledge.py.
+
+Usage:
+    python3 scripts/benchmark_knowledge_memory.py [options]
+
+Examples:
+    python3 scripts/benchmark_knowledge_memory.py
+    python3 scripts/benchmark_knowledge_memory.py --entries 100000 --new 200
+
+Generates a synthetic knowledge file in a temp directory; nothing in the
+project is touched. Needs no API keys or third-party packages.
+"""
+
+import argparse
+import json
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from process_knowledge import (
+    VALID_ROLES,
+    VALID_TOPIC_SLUGS,
+    KnowledgeEntry,
+    merge_knowledge,
+    save_knowledge,
+)
+
+
+# ---------------------------------------------------------------------------
+# Synthetic Data
+# ---------------------------------------------------------------------------
+
+SOURCES = [f"Synthetic Coaching Guide {i}" for i in range(20)]
+
+
+def synthetic_entry(i: int) -> dict:
+    return {
+        "topicSlug": VALID_TOPIC_SLUGS[i % len(VALID_TOPIC_SLUGS)],
+        "coreIdea": f"Idea #{i}: small consistent steps compound into lasting change over time.",
+        "whenToUse": f"When the user (case {i}) feels stuck and wants a simple next action.",
+        "heuristics": [
+            f"Pick one thing to improve this week ({i})",
+            "Review progress every Sunday",
+            "Make the next step obvious",
+        ],
+        "whatToAvoid": [f"Changing everything at once ({i})", "Skipping reviews"],
+        "sourceReference": SOURCES[i % len(SOURCES)],
+        "role": VALID_ROLES[i % len(VALID_ROLES)],
+    }
+
+
+def write_synthetic_file(path: str, count: int) -> None:
+    save_knowledge((synthetic_entry(i) for i in range(count)), path)
+
+
+def synthetic_new_entries(start: int, count: int) -> list:
+    # Every other entry duplicates one already in the file
+    return [
+        KnowledgeEntry(**synthetic_entry(start + i if i % 2 else i))
+        for i in range(count)
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Legacy Merge (pre-streaming behaviour, kept here for comparison only)
+# ---------------------------------------------------------------------------
+
+@dataclass
+class _LegacyEntry:
+    topicSlug: str
+    coreIdea: str
+    whenToUse: str
+    heuristics: list
+    whatToAvoid: list
+    sourceReference: str
+    role: str
+
+
+def _legacy_is_duplicate(new_entry: _LegacyEntry, existing: list) -> bool:
+    new_prefix = new_entry.coreIdea[:60].lower().strip()
+    new_source = new_entry.sourceReference.lower().strip()
+    for entry in existing:
+        src = entry.get("sourceReference", "").lower().strip()
+        prefix = entry.get("coreIdea", "")[:60].lower().strip()
+        if src == new_source and prefix == new_prefix:
+            return True
+    return False
+
+
+def legacy_merge(new_entries: list, output_path: str) -> tuple:
+    new_dicts = [asdict(_LegacyEntry(**e.to_dict())) for e in new_entries]
+    with open(output_path, "r", encoding="utf-8") as f:
+        existing = json.load(f)
+    added = skipped = 0
+    for entry_dict in new_dicts:
+        if _legacy_is_duplicate(_LegacyEntry(**entry_dict), existing):
+            skipped += 1
+        else:
+            existing.append(entry_dict)
+            added += 1
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(existing, f, indent=4, ensure_ascii=False)
+        f.write("\n")
+    return added, skipped, len(existing)
+
+
+# ---------------------------------------------------------------------------
+# Measurement
+# ---------------------------------------------------------------------------
+
+def measure(label: str, fn, *args) -> int:
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = fn(*args)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    added, skipped, total = result
+    print(
+        f"  {label:<10} peak {peak / 2**20:8.1f} MiB   {elapsed:6.2f}s   "
+        f"added={added} skipped={skipped} total={total}"
+    )
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Memory benchmark for merging into a large knowledge file",
+    )
+    parser.add_argument(
+        "--entries", type=int, default=100_000,
+        help="Entries in the synthetic knowledge file (default: 100000)",
+    )
+    parser.add_argument(
+        "--new", type=int, default=100,
+        help="New entries to merge, half of them duplicates (default: 100)",
+    )
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="betterone-bench-"))
+    try:
+        base = workdir / "base.json"
+        print(f"Generating {args.entries} synthetic entries...")
+        write_synthetic_file(str(base), args.entries)
+        print(f"  {base.stat().st_size / 2**20:.1f} MiB on disk\n")
+
+        new_entries = synthetic_new_entries(args.entries, args.new)
+
+        legacy_path = workdir / "legacy.json"
+        stream_path = workdir / "stream.json"
+        shutil.copy(base, legacy_path)
+        shutil.copy(base, stream_path)
+
+        print(f"Merging {args.new} new entries:")
+        legacy_peak = measure("legacy", legacy_merge, new_entries, str(legacy_path))
+        stream_peak = measure("streaming", merge_knowledge, new_entries, str(stream_path))
+
+        if legacy_path.read_bytes() != stream_path.read_bytes():
+            print("\nError: legacy and streaming outputs differ")
+            sys.exit(1)
+
+        print(f"\nOutputs identical; peak memory reduced {legacy_peak / stream_peak:.0f}x")
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
@@ -18,9 +18,11 @@ import argparse
 import json
 import os
 import re
+import shutil
 import sys
+import tempfile
 import time
-from dataclasses import dataclass, asdict
+from itertools import chain
 from pathlib import Path
 from typing import Optional
 
@@ -73,18 +75,51 @@ LLM_MAX_TOKENS = 1024
 # Data Structures
 # ---------------------------------------------------------------------------
 
-@dataclass
 class KnowledgeEntry:
-    topicSlug: str
-    coreIdea: str
-    whenToUse: str
-    heuristics: list
-    whatToAvoid: list
-    sourceReference: str
-    role: str
+    """
+    One knowledge object, kept compact in memory.
+    - __slots__ instead of a per-instance __dict__
+    - topicSlug / role / sourceReference are interned, since a handful of
+      values repeat across every entry from the same PDF
+    """
+
+    __slots__ = (
+        "topicSlug",
+        "coreIdea",
+        "whenToUse",
+        "heuristics",
+        "whatToAvoid",
+        "sourceReference",
+        "role",
+    )
+
+    def __init__(
+        self,
+        topicSlug: str,
+        coreIdea: str,
+        whenToUse: str,
+        heuristics: list,
+        whatToAvoid: list,
+        sourceReference: str,
+        role: str,
+    ):
+        self.topicSlug = sys.intern(topicSlug)
+        self.coreIdea = coreIdea
+        self.whenToUse = whenToUse
+        self.heuristics = heuristics
+        self.whatToAvoid = whatToAvoid
+        self.sourceReference = sys.intern(sourceReference)
+        self.role = sys.intern(role)
+
+    def __repr__(self) -> str:
+        return f"KnowledgeEntry({self.topicSlug!r}, {self.coreIdea[:40]!r}...)"
 
     def to_dict(self) -> dict:
-        return asdict(self)
+        # Field order matches DefaultKnowledge.json
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def dedup_key(self) -> tuple:
+        return dedup_key(self.sourceReference, self.coreIdea)
 
 
 # ---------------------------------------------------------------------------
@@ -401,35 +436,214 @@ def extract_from_chunk(
 # Deduplication & Merge
 # ---------------------------------------------------------------------------
 
-def is_duplicate(new_entry: KnowledgeEntry, existing: list) -> bool:
+def dedup_key(source_reference: str, core_idea: str) -> tuple:
     """Dedup by sourceReference + first 60 chars of coreIdea."""
-    new_prefix = new_entry.coreIdea[:60].lower().strip()
-    new_source = new_entry.sourceReference.lower().strip()
+    return (source_reference.lower().strip(), core_idea[:60].lower().strip())
+
+
+# A token cut at a chunk boundary ("tru", "1.", "\\u00") fails to decode
+# within this many chars of the buffer end; errors further back are corrupt
+# input rather than a need for more text.
+_MAX_PARTIAL_TOKEN = 8
 
-    for entry in existing:
-        src = entry.get("sourceReference", "").lower().strip()
-        prefix = entry.get("coreIdea", "")[:60].lower().strip()
-        if src == new_source and prefix == new_prefix:
-            return True
-    return False
+
+def _needs_more_input(err: json.JSONDecodeError, buf_len: int) -> bool:
+    # Unterminated strings report the opening quote, not the buffer end.
+    # The decoder is strict, so a string can't run past a raw newline.
+    return (
+        err.msg.startswith("Unterminated string")
+        or buf_len - err.pos <= _MAX_PARTIAL_TOKEN
+    )
 
 
-def load_existing(output_path: str) -> list:
-    """Load existing JSON, return [] if not found."""
+def iter_existing(output_path: str, chunk_size: int = 1 << 16):
+    """
+    Stream entry dicts from an existing JSON array one at a time, so a large
+    knowledge file is never held in memory as a whole. Yields nothing if the
+    file is not found; raises ValueError on malformed or empty files, or on
+    items that are not objects. Error positions count characters from the
+    start of the file, as json.load reports them.
+    """
     path = Path(output_path)
     if not path.exists():
-        return []
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+        return
 
+    decoder = json.JSONDecoder()
+    with open(path, "r", encoding="utf-8") as f:
+        buf = ""
+        pos = 0
+        eof = False
+        # Text already dropped from the front of buf, for error positions
+        dropped = 0
+        dropped_lines = 0
+        line_start = 0
+        # "open": expect "[" | "first": item or "]" | "item": item
+        # "sep": "," or "]" | "done": only trailing whitespace
+        state = "open"
+
+        def where(i: int) -> str:
+            head = buf[:i]
+            nl = head.count("\n")
+            start = dropped + head.rindex("\n") + 1 if nl else line_start
+            offset = dropped + i
+            return (
+                f"line {dropped_lines + nl + 1} column {offset - start + 1} "
+                f"(char {offset})"
+            )
 
-def save_knowledge(entries: list, output_path: str) -> None:
-    """Write entries to JSON with pretty formatting."""
-    path = Path(output_path)
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\r\n":
+                pos += 1
+
+            if pos < len(buf):
+                ch = buf[pos]
+                if state == "open":
+                    if ch != "[":
+                        raise ValueError(
+                            f"{output_path}: expected a JSON array: {where(pos)}"
+                        )
+                    state = "first"
+                    pos += 1
+                    continue
+                if state == "done":
+                    raise ValueError(
+                        f"{output_path}: extra data after JSON array: {where(pos)}"
+                    )
+                if state == "sep":
+                    if ch == ",":
+                        state = "item"
+                    elif ch == "]":
+                        state = "done"
+                    else:
+                        raise ValueError(
+                            f"{output_path}: expected ',' or ']': {where(pos)}"
+                        )
+                    pos += 1
+                    continue
+                if ch == "]" and state == "first":
+                    state = "done"
+                    pos += 1
+                    continue
+
+                try:
+                    entry, end = decoder.raw_decode(buf, pos)
+                except json.JSONDecodeError as err:
+                    if eof or not _needs_more_input(err, len(buf)):
+                        raise ValueError(
+                            f"{output_path}: {err.msg}: {where(err.pos)}"
+                        ) from err
+                else:
+                    # A value ending exactly at the buffer end may be a
+                    # scalar cut short; decode again once more text is in
+                    if end < len(buf) or eof:
+                        if not isinstance(entry, dict):
+                            raise ValueError(
+                                f"{output_path}: expected a JSON object: {where(pos)}"
+                            )
+                        yield entry
+                        pos = end
+                        state = "sep"
+                        continue
+
+            if eof:
+                if state != "done":
+                    raise ValueError(
+                        f"{output_path}: unexpected end of file: {where(len(buf))}"
+                    )
+                return
+
+            # Need more input: drop consumed text and read the next chunk
+            consumed = buf[:pos]
+            nl = consumed.count("\n")
+            if nl:
+                line_start = dropped + consumed.rindex("\n") + 1
+                dropped_lines += nl
+            dropped += pos
+
+            more = f.read(chunk_size)
+            eof = not more
+            buf = buf[pos:] + more
+            pos = 0
+
+
+def save_knowledge(entries, output_path: str) -> int:
+    """
+    Write an iterable of entry dicts as a pretty JSON array, one entry at a
+    time. Output matches json.dump(entries, indent=4). The file is written
+    to a temp path and swapped in, so `entries` may stream from output_path
+    itself. Returns the number of entries written.
+
+    A symlinked output_path stays a symlink (its target is replaced), and
+    permission bits are kept. The target is still a new file, though: hard
+    links to it are broken and it is owned by the current user.
+    """
+    path = Path(output_path).resolve()
     path.parent.mkdir(parents=True, exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(entries, f, indent=4, ensure_ascii=False)
-        f.write("\n")
+    count = 0
+    fd, tmp_path = tempfile.mkstemp(
+        dir=path.parent, prefix=f".{path.name}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            if path.exists():
+                shutil.copymode(path, tmp_path)
+            else:
+                umask = os.umask(0)
+                os.umask(umask)
+                os.chmod(tmp_path, 0o666 & ~umask)
+            f.write("[")
+            for entry in entries:
+                f.write(",\n    " if count else "\n    ")
+                body = json.dumps(entry, indent=4, ensure_ascii=False)
+                f.write(body.replace("\n", "\n    "))
+                count += 1
+            f.write("\n]\n" if count else "]\n")
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return count
+
+
+def merge_knowledge(
+    new_entries: list,
+    output_path: str,
+    verbose: bool = False,
+) -> tuple:
+    """
+    Append non-duplicate new entries to the knowledge file.
+    Only dedup keys of the new entries are kept in memory; the existing file
+    is streamed twice (once to find duplicates, once to rewrite it).
+    Returns (added, skipped, total).
+    """
+    pending = {}
+    for entry in new_entries:
+        pending.setdefault(entry.dedup_key(), False)
+
+    for existing in iter_existing(output_path):
+        key = dedup_key(
+            existing.get("sourceReference", ""), existing.get("coreIdea", "")
+        )
+        if key in pending:
+            pending[key] = True
+
+    fresh = []
+    skipped = 0
+    for entry in new_entries:
+        key = entry.dedup_key()
+        if pending[key]:
+            skipped += 1
+            if verbose:
+                print(f"  [dup] {entry.coreIdea[:60]}...")
+        else:
+            pending[key] = True
+            fresh.append(entry)
+
+    total = save_knowledge(
+        chain(iter_existing(output_path), (e.to_dict() for e in fresh)),
+        output_path,
+    )
+    return len(fresh), skipped, total
 
 
 # ---------------------------------------------------------------------------
@@ -613,43 +827,28 @@ Examples:
         print("\nNo knowledge entries extracted.")
         sys.exit(0)
 
-    new_dicts = [e.to_dict() for e in new_entries]
-
     # Summary by topic
     topic_counts = {}
-    for d in new_dicts:
-        slug = d["topicSlug"]
+    for entry in new_entries:
+        slug = entry.topicSlug
         topic_counts[slug] = topic_counts.get(slug, 0) + 1
-    print(f"\nExtracted {len(new_dicts)} entries:")
+    print(f"\nExtracted {len(new_entries)} entries:")
     for slug, count in sorted(topic_counts.items()):
         print(f"  {slug}: {count}")
 
     if args.dry_run:
         print(f"\n--- Dry Run Output ---")
+        new_dicts = [e.to_dict() for e in new_entries]
         print(json.dumps(new_dicts, indent=4, ensure_ascii=False))
         return
 
     # Merge with existing
-    existing = load_existing(output_path)
-    added = 0
-    skipped = 0
-
-    for entry_dict in new_dicts:
-        entry_obj = KnowledgeEntry(**entry_dict)
-        if is_duplicate(entry_obj, existing):
-            skipped += 1
-            if args.verbose:
-                print(f"  [dup] {entry_dict['coreIdea'][:60]}...")
-        else:
-            existing.append(entry_dict)
-            added += 1
-
-    save_knowledge(existing, output_path)
+    added, skipped, total = merge_knowledge(new_entries, output_path, args.verbose)
 
     print(f"\nDone!")
     print(f"  Added:   {added} new entries")
     print(f"  Skipped: {skipped} duplicates")
-    print(f"  Total:   {len(existing)} entries in {output_path}")
+    print(f"  Total:   {total} entries in {output_path}")
 
 
 if __name__ == "__main__":